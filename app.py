@@ -1,9 +1,17 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import os
+import functools
+import tempfile
 import warnings
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 warnings.filterwarnings('ignore')
 
 # Page configuration
@@ -15,60 +23,297 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
-    <style>
-    .main {
-        padding: 0rem 1rem;
-    }
-    .stMetric {
-        background-color: #f0f2f6;
-        padding: 15px;
-        border-radius: 10px;
-        box-shadow: 2px 2px 5px rgba(0,0,0,0.1);
-    }
-    h1 {
-        color: #1f77b4;
-        padding-bottom: 20px;
-    }
-    h2 {
-        color: #2c3e50;
-        padding-top: 20px;
+@st.cache_resource
+def css():
+    """Dashboard stylesheet, read once per server process"""
+    with open(os.path.join('assets', 'style.css')) as f:
+        return f.read()
+
+st.markdown(f"<style>{css()}</style>", unsafe_allow_html=True)
+
+# Parquet cache for the CSV files
+CACHE_DIR = '.cache'
+
+def prepare_correlation(df):
+    """Index the correlation matrix by its label column and store it as float32"""
+    label_col = df.columns[0]
+    if not pd.api.types.is_numeric_dtype(df[label_col]):
+        df = df.set_index(label_col).rename_axis(None)
+    return df.astype(np.float32)
+
+# Candidate column names for each role a dataset's columns can play, in order of
+# preference. They are shared by the cache step, the column pruning and the views.
+ROLES = {
+    'campaign_performance': {
+        'budget': ['Budget', 'budget', 'Campaign_Budget', 'Spend', 'Cost'],
+        # The Budget vs ROI scatter looks for spend columns in its own order
+        'spend': ['Budget', 'Spend', 'Cost'],
+        'conversions': ['Conversions', 'conversions', 'Total_Conversions'],
+        'name': ['CampaignName', 'Campaign_Name', 'Campaign', 'Name'],
+        'metric': ['Conversions', 'Revenue', 'Sales', 'Clicks'],
+        'roi': ['ROI', 'ROAS', 'Return']
+    },
+    'channel_attribution': {
+        'channel': ['Channel', 'channel', 'Marketing_Channel'],
+        'conversions': ['Conversions', 'conversions', 'Total_Conversions'],
+        'revenue': ['Revenue', 'revenue', 'Sales', 'Amount']
+    },
+    'customer_data': {
+        'age': ['Age', 'age', 'Customer_Age'],
+        'income': ['Income', 'income', 'Annual_Income', 'Salary']
+    },
+    'feature_importance': {
+        'feature': ['Feature', 'feature', 'Variable', 'Column'],
+        'importance': ['Importance', 'importance', 'Score', 'Weight']
+    },
+    'funnel_data': {
+        'stage': ['Stage', 'stage', 'Step', 'Funnel_Stage'],
+        'users': ['Count', 'count', 'Users', 'Visitors']
+    },
+    'geographic_data': {
+        'region': ['Region', 'region', 'Area', 'Territory'],
+        'country': ['Country', 'country', 'Nation']
+    },
+    'lead_scoring_results': {
+        'score': ['LeadScore', 'Score', 'Lead_Score', 'Probability']
+    },
+    'product_sales': {
+        'sales': ['Sales', 'Revenue', 'Total_Sales', 'Amount'],
+        # The top-10 side file and the top-10 and category charts never pick Total_Sales
+        'top_sales': ['Sales', 'Revenue', 'Amount'],
+        # The Overview total prefers revenue over sales
+        'revenue': ['Revenue', 'Sales', 'Total_Sales', 'Amount'],
+        'quantity': ['Quantity', 'Units', 'Qty', 'Units_Sold'],
+        'product': ['Product', 'ProductName', 'Product_Name', 'Item'],
+        'category': ['Category', 'Product_Category', 'Type']
     }
-    </style>
-    """, unsafe_allow_html=True)
+}
 
-# Load data function with better error handling
-@st.cache_data
-def load_data():
-    """Load all CSV files from Dataset folder"""
+def first_present(possible_names, columns):
+    """Return the first of possible_names found in columns"""
+    return next((name for name in possible_names if name in columns), None)
+
+def prepare_feature_importance(df):
+    """Store features in ascending importance so the ranking chart needs no sort"""
+    importance_col = first_present(ROLES['feature_importance']['importance'], df.columns)
+    if importance_col:
+        df = df.sort_values(importance_col).reset_index(drop=True)
+    return df
+
+def top_sales(df):
+    """The ten best-selling rows, or None when there is no sales column"""
+    sales_col = first_present(ROLES['product_sales']['top_sales'], df.columns)
+    if sales_col:
+        return df.nlargest(10, sales_col).reset_index(drop=True)
+    return None
+
+def downcast_numeric(df):
+    """Shrink 64-bit numeric columns to the smallest dtype that holds their values"""
+    for col in df.select_dtypes('int64').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+        # ID-like columns stay at least int32
+        if col.lower().endswith('id') and df[col].dtype.itemsize < 4:
+            df[col] = df[col].astype(np.int32)
+    
+    # pandas only narrows floats whose float32 values stay close to the originals
+    for col in df.select_dtypes('float64').columns:
+        df[col] = pd.to_numeric(df[col], downcast='float')
+    
+    return df
+
+# Transforms applied once, before a CSV is written to the Parquet cache
+PREPARE = {
+    'correlation_matrix.csv': prepare_correlation,
+    'feature_importance.csv': prepare_feature_importance
+}
+
+# Small derived tables written next to a dataset's cache as <name>_<suffix>.parquet
+SIDE_FILES = {
+    'product_sales.csv': {'top10': top_sales}
+}
+
+def side_file_path(filepath, suffix):
+    """Path of a derived side file for a CSV"""
+    name = os.path.splitext(os.path.basename(filepath))[0]
+    return os.path.join(CACHE_DIR, f"{name}_{suffix}.parquet")
+
+def read_csv(filepath):
+    """Parse a CSV with Arrow's multithreaded reader, or pandas' own parser for files it rejects"""
+    try:
+        return pd.read_csv(filepath, engine="pyarrow")
+    except ValueError:
+        return pd.read_csv(filepath)
+
+def write_parquet(df, path):
+    """Write a frame to Parquet through a temp file, so an interrupted write leaves no partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_path, engine="pyarrow", compression="zstd")
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def is_fresh(cache_path, source_mtime):
+    """Whether a Parquet cache exists, is newer than its sources and has a readable footer"""
+    if not os.path.exists(cache_path) or os.path.getmtime(cache_path) < source_mtime:
+        return False
+    try:
+        pq.read_metadata(cache_path)
+    except (OSError, ValueError):
+        return False
+    return True
+
+@st.cache_resource
+def parquet_cache(filepath):
+    """Return the Parquet cache path for a CSV, rebuilding it if missing or stale"""
+    name = os.path.splitext(os.path.basename(filepath))[0]
+    cache_path = os.path.join(CACHE_DIR, f"{name}.parquet")
+    
+    # Rebuild when the cache is unreadable or the CSV or the code preparing it is newer
+    source_mtime = max(os.path.getmtime(filepath), os.path.getmtime(__file__))
+    if not is_fresh(cache_path, source_mtime):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        df = read_csv(filepath)
+        prepare = PREPARE.get(os.path.basename(filepath))
+        if prepare:
+            df = prepare(df)
+        df = downcast_numeric(df)
+        
+        # Side files go first, so a complete main cache implies complete side files
+        for suffix, build in SIDE_FILES.get(os.path.basename(filepath), {}).items():
+            side_path = side_file_path(filepath, suffix)
+            side = build(df)
+            if side is not None:
+                write_parquet(side, side_path)
+            elif os.path.exists(side_path):
+                os.remove(side_path)
+        write_parquet(df, cache_path)
+    
+    return cache_path
+
+# Rows in each data table preview, until changed in the sidebar
+PREVIEW_ROWS = 200
+
+# Dataset files, loaded lazily by the views that need them
+DATASETS = {
+    'campaign_performance': 'campaign_performance.csv',
+    'channel_attribution': 'channel_attribution.csv',
+    'correlation_matrix': 'correlation_matrix.csv',
+    'customer_data': 'customer_data.csv',
+    'customer_journey': 'customer_journey.csv',
+    'feature_importance': 'feature_importance.csv',
+    'funnel_data': 'funnel_data.csv',
+    'geographic_data': 'geographic_data.csv',
+    'lead_scoring_results': 'lead_scoring_results.csv',
+    'learning_curve': 'learning_curve.csv',
+    'product_sales': 'product_sales.csv'
+}
+
+# String columns with fewer distinct values than this share of their rows are
+# stored as category, so counts and group sums run on integer codes
+CATEGORY_MAX_RATIO = 0.5
+
+def categorize(df):
+    """Cast low-cardinality string columns to category"""
+    for col in df.columns:
+        if (pd.api.types.is_string_dtype(df[col])
+                and df[col].nunique() < CATEGORY_MAX_RATIO * len(df)):
+            df[col] = df[col].astype("category")
+    return df
+
+# Datasets whose frames are shown or described in full, so every column is loaded
+UNPRUNED = frozenset(['correlation_matrix', 'customer_data', 'customer_journey', 'learning_curve'])
+
+# Columns the views can read from each pruned dataset: the union of its role candidates
+NEEDED_COLUMNS = {
+    name: frozenset(col for candidates in dataset_roles.values() for col in candidates)
+    for name, dataset_roles in ROLES.items() if name not in UNPRUNED
+}
+
+@st.cache_resource(show_spinner=False)
+def parquet_dataset(name):
+    """Arrow dataset over a dataset's Parquet cache, which reads nothing until scanned"""
+    return ds.dataset(parquet_cache(DATASETS[name]), format="parquet")
+
+def column_names(name):
+    """All column names of a dataset, read from the Parquet schema"""
+    schema = parquet_dataset(name).schema
+    # Skip the columns pandas stored its index in, such as the correlation matrix labels
+    index_columns = (schema.pandas_metadata or {}).get('index_columns', [])
+    return [col for col in schema.names if col not in index_columns]
+
+@st.cache_resource(show_spinner=False)
+def meta(name):
+    """Row and column counts of a dataset, read once from the Parquet metadata"""
+    return {'n_rows': parquet_dataset(name).count_rows(), 'n_cols': len(column_names(name))}
+
+@st.cache_resource(show_spinner=False)
+def arrow_table(name):
+    """Scan the needed columns of a dataset's Parquet cache using Arrow's thread pool"""
+    needed = NEEDED_COLUMNS.get(name)
+    if needed is not None:
+        needed = [col for col in column_names(name) if col in needed]
+    return parquet_dataset(name).to_table(columns=needed, use_threads=True)
+
+# Shared across reruns and sessions without a pickle copy, so views must not mutate it
+@st.cache_resource(show_spinner=False)
+def load_dataset(name):
+    """Load a single dataset as a pandas frame backed by its Arrow buffers"""
+    return categorize(arrow_table(name).to_pandas(types_mapper=pd.ArrowDtype))
+
+@st.cache_resource
+def loaded_datasets():
+    """Names of the datasets already held in load_dataset's cache in this process"""
+    return set()
+
+class DatasetsUnavailable(Exception):
+    """Raised by get_many once it has reported the datasets that failed to load"""
+
+# Load data with better error handling
+def get_many(names):
+    """Load the requested datasets, stopping the app if any of them fail"""
     data_dict = {}
-    
-    files = {
-        'campaign_performance': 'campaign_performance.csv',
-        'channel_attribution': 'channel_attribution.csv',
-        'correlation_matrix': 'correlation_matrix.csv',
-        'customer_data': 'customer_data.csv',
-        'customer_journey': 'customer_journey.csv',
-        'feature_importance': 'feature_importance.csv',
-        'funnel_data': 'funnel_data.csv',
-        'geographic_data': 'geographic_data.csv',
-        'lead_scoring_results': 'lead_scoring_results.csv',
-        'learning_curve': 'learning_curve.csv',
-        'product_sales': 'product_sales.csv'
-    }
-    
     errors = []
+    # Views run as fragments, which cannot write to st.sidebar, so statuses are
+    # recorded here and drawn by show_load_status() from the main script
+    status = st.session_state.setdefault('load_status', {})
+    
+    # Cold loads are mostly Parquet reads and Arrow decoding, which release the GIL,
+    # so several of them overlap in worker threads; each worker shares this script
+    # run's context. Warm and single loads stay on this thread.
+    loaded = loaded_datasets()
+    cold = [name for name in names if name not in loaded]
+    futures = {}
+    
+    if len(cold) > 1:
+        ctx = get_script_run_ctx()
+        
+        def load(name):
+            add_script_run_ctx(ctx=ctx)
+            return load_dataset(name)
+        
+        with st.spinner("Loading data..."), ThreadPoolExecutor(max_workers=min(8, len(cold))) as pool:
+            futures = {name: pool.submit(load, name) for name in cold}
     
-    for key, filepath in files.items():
+    for name in names:
         try:
-            data_dict[key] = pd.read_csv(filepath)
-            st.sidebar.success(f"✅ Loaded {key}")
+            if name in futures:
+                data_dict[name] = futures[name].result()
+            elif name in loaded:
+                data_dict[name] = load_dataset(name)
+            else:
+                with st.spinner("Loading data..."):
+                    data_dict[name] = load_dataset(name)
+            loaded.add(name)
+            status[name] = f"✅ Loaded {name}"
         except FileNotFoundError:
-            errors.append(f"❌ File not found: {filepath}")
-            st.sidebar.error(f"❌ Missing: {key}")
+            errors.append(f"❌ File not found: {DATASETS[name]}")
+            status[name] = f"❌ Missing: {name}"
         except Exception as e:
-            errors.append(f"❌ Error loading {key}: {str(e)}")
-            st.sidebar.error(f"❌ Error: {key}")
+            errors.append(f"❌ Error loading {name}: {str(e)}")
+            status[name] = f"❌ Error: {name}"
     
     if errors:
         st.error("### Errors loading data:")
@@ -81,20 +326,30 @@ def load_data():
         2. Verify file names match exactly (case-sensitive)
         3. Ensure files are not corrupted
         """)
-        return None
+        # Not st.stop(), which would also drop the sidebar statuses drawn after the view
+        raise DatasetsUnavailable(names)
     
     return data_dict
 
-# Load data
-with st.spinner("Loading data..."):
-    data = load_data()
+def get(name):
+    """Load a single dataset"""
+    return get_many([name])[name]
 
-if data is None or len(data) == 0:
-    st.stop()
+def show_load_status():
+    """Draw the dataset load statuses recorded by get_many as a single sidebar list"""
+    status = st.session_state.get('load_status', {})
+    if status:
+        st.sidebar.markdown("\n".join(f"- {message}" for message in status.values()))
+
+@st.cache_data
+def logo():
+    """Sidebar logo, bundled locally so reruns never fetch it over the network"""
+    with open(os.path.join('assets', 'business-report.svg')) as f:
+        return f.read()
 
 # Sidebar
 with st.sidebar:
-    st.image("https://img.icons8.com/clouds/100/000000/business-report.png", width=100)
+    st.image(logo(), width=100)
     st.title("📊 Marketing Analytics")
     st.markdown("---")
     
@@ -106,6 +361,9 @@ with st.sidebar:
          "Feature Importance", "Correlation Analysis"]
     )
     
+    st.number_input("Rows to show", min_value=50, max_value=5000, value=PREVIEW_ROWS,
+                    step=50, key='preview_rows', help="Rows in each data table preview")
+    
     st.markdown("---")
     st.info("💡 **Tip**: Explore different views")
 
@@ -113,45 +371,330 @@ with st.sidebar:
 st.title("🎯 Marketing Analytics Dashboard")
 st.markdown("### Comprehensive Marketing Performance Analysis")
 
+# Column names per dataset, hashed once per process for O(1) membership checks
+@st.cache_resource(show_spinner=False)
+def schema(name):
+    """Return the column names of a dataset as a frozenset"""
+    return frozenset(column_names(name))
+
 # Helper function to safely get column
-def safe_column(df, possible_names):
+def safe_column(dataset, possible_names):
     """Return first matching column name from list"""
-    for name in possible_names:
-        if name in df.columns:
-            return name
-    return None
+    return first_present(possible_names, schema(dataset))
+
+@st.cache_resource(show_spinner=False)
+def roles(name):
+    """Resolve each role of a dataset to its column name, or None, as attributes of a namedtuple"""
+    Roles = namedtuple(f"{name}_roles", ROLES[name])
+    return Roles(*(safe_column(name, candidates) for candidates in ROLES[name].values()))
+
+# Cached aggregations, keyed by dataset and column names so no frame is ever hashed;
+# the loaded frames are cache_resource objects that never change
+@st.cache_data(show_spinner=False)
+def describe(name):
+    """Summary statistics for a dataset's numeric columns"""
+    return get(name).describe(include=[np.number])
+
+@st.cache_data(show_spinner=False)
+def side_table(name, suffix):
+    """Load a derived side file written alongside a dataset's cache, if there is one"""
+    filepath = DATASETS[name]
+    parquet_cache(filepath)
+    side_path = side_file_path(filepath, suffix)
+    if not os.path.exists(side_path):
+        return None
+    return pd.read_parquet(side_path, engine="pyarrow", dtype_backend="pyarrow")
+
+def group_codes(series):
+    """Integer group codes and their labels, reusing categorical codes when present"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    return pd.factorize(series)
+
+@st.cache_data(show_spinner=False)
+def groupby_sum(name, key_col, val_col):
+    """Sum of val_col for each observed key_col group, via np.bincount on group codes"""
+    df = get(name)
+    codes, keys = group_codes(df[key_col])
+    present = codes >= 0
+    values = df[val_col].to_numpy(dtype=np.float64, na_value=0.0)[present]
+    
+    sums = np.bincount(codes[present], weights=values, minlength=len(keys))
+    observed = np.bincount(codes[present], minlength=len(keys)) > 0
+    return pd.DataFrame({key_col: keys[observed], val_col: sums[observed]})
+
+@st.cache_data(show_spinner=False)
+def value_counts_top(name, col, n=None):
+    """Row counts per value of col, most common first, optionally limited to n values"""
+    codes, keys = group_codes(get(name)[col])
+    counts = np.bincount(codes[codes >= 0], minlength=len(keys))
+    
+    order = np.argsort(-counts, kind='stable')
+    order = order[counts[order] > 0][:n]
+    return pd.DataFrame({col: keys[order], 'Count': counts[order]})
+
+@st.cache_data(show_spinner=False)
+def top_correlated(k):
+    """The correlation matrix cut to the k features with the largest total absolute correlation"""
+    df = get('correlation_matrix')
+    if k >= len(df.columns):
+        return df
+    
+    top = df.abs().sum().nlargest(k).index
+    # Square matrices keep the same features on both axes
+    return df.loc[top, top] if top.isin(df.index).all() else df[top]
+
+@st.cache_data(show_spinner=False)
+def column_stats(name, col):
+    """Sum, mean and max of a dataset's numeric column, computed by Arrow kernels on its table"""
+    values = arrow_table(name).column(col)
+    # Match pandas on all-null columns: a zero sum and NaN rather than None
+    mean, largest = pc.mean(values).as_py(), pc.max(values).as_py()
+    return {'sum': pc.sum(values, min_count=0).as_py(),
+            'mean': np.nan if mean is None else mean,
+            'max': np.nan if largest is None else largest}
+
+# KPI scalars per dataset: a meta() count, or the role and column_stats aggregate
+KPIS = {
+    'customer_data': {
+        'total_customers': 'n_rows',
+        'customer_columns': 'n_cols',
+        'avg_age': ('age', 'mean'),
+        'avg_income': ('income', 'mean')
+    },
+    'campaign_performance': {
+        'total_campaigns': 'n_rows',
+        'total_budget': ('budget', 'sum'),
+        'total_conversions': ('conversions', 'sum')
+    },
+    'product_sales': {
+        'total_products': 'n_rows',
+        'total_sales': ('sales', 'sum'),
+        # The Overview total prefers a revenue column over a sales one
+        'total_revenue': ('revenue', 'sum'),
+        'total_units': ('quantity', 'sum')
+    },
+    'lead_scoring_results': {
+        'total_leads': 'n_rows',
+        'avg_lead_score': ('score', 'mean'),
+        'max_lead_score': ('score', 'max')
+    }
+}
+
+@st.cache_resource(show_spinner=False)
+def kpis(name):
+    """A dataset's KPI scalars, computed once since the datasets never change"""
+    cols = roles(name)
+    scalars = {}
+    for key, source in KPIS[name].items():
+        if isinstance(source, str):
+            scalars[key] = meta(name)[source]
+        else:
+            col = getattr(cols, source[0])
+            scalars[key] = column_stats(name, col)[source[1]] if col else None
+    return scalars
+
+def hist_counts(values, nbins=30):
+    """Histogram bin centers, width and counts in a single bincount pass, with about nbins rounded bins"""
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return np.empty(0), 0.0, np.empty(0, dtype=np.int64)
+    
+    lo, hi = values.min(), values.max()
+    if hi == lo:
+        return np.array([lo]), 1.0, np.array([values.size])
+    
+    # Round the width up to 1, 2, 2.5 or 5 times a power of ten, as plotly's own bins are
+    raw = (hi - lo) / nbins
+    magnitude = 10.0 ** np.floor(np.log10(raw))
+    width = magnitude * next(step for step in (1, 2, 2.5, 5, 10) if step * magnitude >= raw)
+    start = np.floor(lo / width) * width
+    if np.array_equal(values, np.round(values)):
+        # Whole-number widths with edges between the integers give every bin as many values
+        width = float(max(1, np.ceil(width)))
+        start = np.floor(lo / width) * width - 0.5
+    n = int((hi - start) // width) + 1
+    bins = ((values - start) // width).astype(np.int64)
+    # Guard the last bin against rounding in the division
+    np.minimum(bins, n - 1, out=bins)
+    
+    counts = np.bincount(bins, minlength=n)
+    centers = start + width * (np.arange(n) + 0.5)
+    return centers, width, counts
+
+@st.cache_data(show_spinner=False)
+def column_hist(name, col, nbins=30):
+    """Histogram of a dataset's numeric column, binned once per dataset column"""
+    return hist_counts(value_array(get(name)[col]), nbins)
+
+# Table previews, one cached slice per dataset and row count
+@st.cache_resource(show_spinner=False, max_entries=64)
+def preview(name, n=PREVIEW_ROWS):
+    """First n rows of a dataset with all of its columns, read from the leading row groups only"""
+    return parquet_dataset(name).head(n)
+
+@st.cache_data(show_spinner=False)
+def parquet_bytes(name):
+    """Raw bytes of a dataset's Parquet cache file"""
+    with open(parquet_cache(DATASETS[name]), 'rb') as f:
+        return f.read()
+
+def show_table(name):
+    """Preview the first rows of a dataset and offer the full table as a download"""
+    n = st.session_state.get('preview_rows', PREVIEW_ROWS)
+    total_rows = meta(name)['n_rows']
+    st.dataframe(preview(name, n), use_container_width=True)
+    
+    if total_rows > n:
+        st.caption(f"Showing the first {n:,} of {total_rows:,} rows")
+    st.download_button("⬇️ Download full table (Parquet)", parquet_bytes(name),
+                       file_name=f"{name}.parquet", mime="application/octet-stream",
+                       key=f"download_{name}", on_click="ignore")
+
+# Chart builders, looked up by name so built figures can be cached
+def bar_chart(x, y, x_title, y_title, colorscale, orientation='v', tickangle=None):
+    """Bar chart colored by bar length"""
+    values = x if orientation == 'h' else y
+    title = x_title if orientation == 'h' else y_title
+    return go.Figure(go.Bar(x=x, y=y, orientation=orientation,
+                            marker=dict(color=values, colorscale=colorscale,
+                                        showscale=True, colorbar=dict(title=title))),
+                     layout=dict(xaxis_title=x_title, yaxis_title=y_title,
+                                 xaxis_tickangle=tickangle))
+
+def histogram_chart(centers, width, counts, x_title, color):
+    """Histogram drawn as bars from precomputed bin counts"""
+    return go.Figure(go.Bar(x=centers, y=counts, width=width, marker_color=color),
+                     layout=dict(xaxis_title=x_title, yaxis_title='count', bargap=0))
+
+def box_chart(y, y_title, color):
+    """Single box plot"""
+    return go.Figure(go.Box(y=y, name='', marker_color=color),
+                     layout=dict(yaxis_title=y_title))
+
+# Larger scatters are drawn with WebGL, as px.scatter's auto render mode does, from a
+# fixed random sample above the cap, and the largest as binned counts
+SCATTER_WEBGL_MIN_POINTS = 1000
+SCATTER_MAX_POINTS = 5000
+DENSITY_MIN_POINTS = 20000
+
+def density_chart(x, y, x_title, y_title, colorscale, nbins=40):
+    """Point density as a heatmap of counts binned on the server"""
+    present = ~(np.isnan(x) | np.isnan(y))
+    counts, x_edges, y_edges = np.histogram2d(x[present], y[present], bins=nbins)
+    return go.Figure(go.Heatmap(z=counts.T, x=(x_edges[:-1] + x_edges[1:]) / 2,
+                                y=(y_edges[:-1] + y_edges[1:]) / 2, colorscale=colorscale,
+                                colorbar=dict(title='count')),
+                     layout=dict(xaxis_title=x_title, yaxis_title=y_title))
+
+def scatter_chart(x, y, x_title, y_title, colorscale):
+    """Scatter plot colored by the y value, sampled or binned when there are many points"""
+    if x.size > DENSITY_MIN_POINTS:
+        return density_chart(x, y, x_title, y_title, colorscale)
+    if x.size > SCATTER_MAX_POINTS:
+        sample = np.sort(np.random.default_rng(0).choice(x.size, SCATTER_MAX_POINTS, replace=False))
+        x, y = x[sample], y[sample]
+    
+    trace = go.Scattergl if x.size > SCATTER_WEBGL_MIN_POINTS else go.Scatter
+    return go.Figure(trace(x=x, y=y, mode='markers',
+                           marker=dict(color=y, colorscale=colorscale,
+                                       showscale=True, colorbar=dict(title=y_title))),
+                     layout=dict(xaxis_title=x_title, yaxis_title=y_title))
+
+def pie_chart(values, labels, hole=0):
+    """Pie or donut chart"""
+    return go.Figure(go.Pie(values=values, labels=labels, hole=hole))
+
+def funnel_chart(stages, counts):
+    """Conversion funnel"""
+    return go.Figure(go.Funnel(y=stages, x=counts, textinfo="value+percent initial"))
+
+def heatmap_chart(z, x, y, colorscale):
+    """Annotated heatmap with the cell labels formatted once"""
+    return go.Figure(go.Heatmap(z=z, x=x, y=y,
+                                text=np.char.mod('%.2f', z), texttemplate='%{text}',
+                                colorscale=colorscale),
+                     layout=dict(yaxis_autorange='reversed'))
+
+BUILDERS = {
+    'bar': bar_chart,
+    'histogram': histogram_chart,
+    'box': box_chart,
+    'scatter': scatter_chart,
+    'pie': pie_chart,
+    'funnel': funnel_chart,
+    'heatmap': heatmap_chart
+}
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def chart(builder_name, *arrays, **options):
+    """Build a figure once per distinct input and share it across reruns"""
+    return BUILDERS[builder_name](*arrays, **options)
+
+def label_array(series):
+    """Column values as a fixed-width string array, which hashes by content"""
+    return series.to_numpy().astype(str)
+
+def value_array(series):
+    """Numeric column in its own dtype, or as float64 with NaN when it has nulls"""
+    if series.hasnans:
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return series.to_numpy()
+
+def column_array(series):
+    """Chart input for a column: numeric columns as values, anything else as labels"""
+    if pd.api.types.is_numeric_dtype(series):
+        return value_array(series)
+    return label_array(series)
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def dataset_chart(builder_name, name, columns, **options):
+    """Build a figure from whole dataset columns, keyed by their names so no column is hashed"""
+    df = get(name)
+    return BUILDERS[builder_name](*(column_array(df[col]) for col in columns), **options)
+
+def view(func):
+    """Run an analysis view as a fragment that ends quietly when its data fails to load"""
+    @functools.wraps(func)
+    def run():
+        try:
+            func()
+        except DatasetsUnavailable:
+            pass
+    return st.fragment(run)
 
 # Overview Section
-if analysis_type == "Overview":
+@view
+def view_overview():
     st.header("📈 Executive Summary")
     
+    # Counts come from the Parquet metadata; loading first reports any missing files together
+    get_many(['campaign_performance', 'channel_attribution', 'customer_data',
+              'customer_journey', 'feature_importance', 'funnel_data',
+              'geographic_data', 'lead_scoring_results', 'product_sales'])
+    
     # KPI Metrics
+    k = {**kpis('customer_data'), **kpis('product_sales'),
+         **kpis('campaign_performance'), **kpis('lead_scoring_results')}
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_customers = len(data['customer_data'])
-        st.metric("Total Customers", f"{total_customers:,}")
+        st.metric("Total Customers", f"{k['total_customers']:,}")
     
     with col2:
-        # Try different column names for revenue/sales
-        sales_col = safe_column(data['product_sales'], ['Revenue', 'Sales', 'Total_Sales', 'Amount'])
-        if sales_col:
-            total_sales = data['product_sales'][sales_col].sum()
-            st.metric("Total Sales", f"${total_sales:,.0f}")
+        if k['total_revenue'] is not None:
+            st.metric("Total Sales", f"${k['total_revenue']:,.0f}")
         else:
-            st.metric("Total Products", len(data['product_sales']))
+            st.metric("Total Products", k['total_products'])
     
     with col3:
-        total_campaigns = len(data['campaign_performance'])
-        st.metric("Total Campaigns", total_campaigns)
+        st.metric("Total Campaigns", k['total_campaigns'])
     
     with col4:
-        lead_score_col = safe_column(data['lead_scoring_results'], ['LeadScore', 'Score', 'Lead_Score'])
-        if lead_score_col:
-            avg_lead_score = data['lead_scoring_results'][lead_score_col].mean()
-            st.metric("Avg Lead Score", f"{avg_lead_score:.2f}")
+        if k['avg_lead_score'] is not None:
+            st.metric("Avg Lead Score", f"{k['avg_lead_score']:.2f}")
         else:
-            st.metric("Total Leads", len(data['lead_scoring_results']))
+            st.metric("Total Leads", k['total_leads'])
     
     st.markdown("---")
     
@@ -163,58 +706,66 @@ if analysis_type == "Overview":
     with col1:
         st.info(f"""
         **Loaded Datasets:**
-        - Campaign Performance: {len(data['campaign_performance'])} rows
-        - Customer Data: {len(data['customer_data'])} rows
-        - Product Sales: {len(data['product_sales'])} rows
-        - Geographic Data: {len(data['geographic_data'])} rows
-        - Lead Scoring: {len(data['lead_scoring_results'])} rows
+        - Campaign Performance: {meta('campaign_performance')['n_rows']} rows
+        - Customer Data: {meta('customer_data')['n_rows']} rows
+        - Product Sales: {meta('product_sales')['n_rows']} rows
+        - Geographic Data: {meta('geographic_data')['n_rows']} rows
+        - Lead Scoring: {meta('lead_scoring_results')['n_rows']} rows
         """)
     
     with col2:
         st.info(f"""
         **Additional Data:**
-        - Channel Attribution: {len(data['channel_attribution'])} rows
-        - Customer Journey: {len(data['customer_journey'])} rows
-        - Funnel Data: {len(data['funnel_data'])} rows
-        - Feature Importance: {len(data['feature_importance'])} rows
+        - Channel Attribution: {meta('channel_attribution')['n_rows']} rows
+        - Customer Journey: {meta('customer_journey')['n_rows']} rows
+        - Funnel Data: {meta('funnel_data')['n_rows']} rows
+        - Feature Importance: {meta('feature_importance')['n_rows']} rows
         """)
     
     # Show sample data
     st.markdown("---")
     st.subheader("📋 Sample Data Preview")
     
-    dataset_to_show = st.selectbox("Select dataset to preview:", list(data.keys()))
-    st.dataframe(data[dataset_to_show].head(10), use_container_width=True)
+    sample_preview()
+
+# A nested fragment, so picking another dataset reruns only the preview
+@view
+def sample_preview():
+    dataset_to_show = st.selectbox("Select dataset to preview:", list(DATASETS))
+    # Load it first so a missing file is reported like in the other views
+    get(dataset_to_show)
+    st.dataframe(preview(dataset_to_show, 10), use_container_width=True)
     
     # Show column names
     with st.expander("📝 View Column Names"):
         st.write(f"**Columns in {dataset_to_show}:**")
-        st.write(list(data[dataset_to_show].columns))
+        st.write(column_names(dataset_to_show))
 
 # Customer Analysis
-elif analysis_type == "Customer Analysis":
+@view
+def view_customer_analysis():
     st.header("👥 Customer Analysis")
     
-    df = data['customer_data']
+    get('customer_data')
+    cols = roles('customer_data')
     
     # KPIs
+    k = kpis('customer_data')
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Customers", len(df))
+        st.metric("Total Customers", k['total_customers'])
     
     with col2:
-        age_col = safe_column(df, ['Age', 'age', 'Customer_Age'])
-        if age_col:
-            st.metric("Avg Age", f"{df[age_col].mean():.1f}")
+        if k['avg_age'] is not None:
+            st.metric("Avg Age", f"{k['avg_age']:.1f}")
     
     with col3:
-        income_col = safe_column(df, ['Income', 'income', 'Annual_Income', 'Salary'])
-        if income_col:
-            st.metric("Avg Income", f"${df[income_col].mean():,.0f}")
+        if k['avg_income'] is not None:
+            st.metric("Avg Income", f"${k['avg_income']:,.0f}")
     
     with col4:
-        st.metric("Total Columns", len(df.columns))
+        st.metric("Total Columns", k['customer_columns'])
     
     st.markdown("---")
     
@@ -226,56 +777,57 @@ elif analysis_type == "Customer Analysis":
         
         with col1:
             # Age distribution
-            age_col = safe_column(df, ['Age', 'age', 'Customer_Age'])
-            if age_col:
+            if cols.age:
                 st.subheader("Age Distribution")
-                fig = px.histogram(df, x=age_col, nbins=30, 
-                                 color_discrete_sequence=['#1f77b4'])
+                centers, width, counts = column_hist('customer_data', cols.age)
+                fig = chart('histogram', centers, width, counts,
+                            x_title=cols.age, color='#1f77b4')
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.info("Age column not found")
         
         with col2:
             # Income distribution
-            income_col = safe_column(df, ['Income', 'income', 'Annual_Income'])
-            if income_col:
+            if cols.income:
                 st.subheader("Income Distribution")
-                fig = px.box(df, y=income_col, color_discrete_sequence=['#2ecc71'])
+                fig = dataset_chart('box', 'customer_data', (cols.income,),
+                                    y_title=cols.income, color='#2ecc71')
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.info("Income column not found")
     
     with tab2:
-        st.dataframe(df, use_container_width=True)
+        show_table('customer_data')
     
     with tab3:
-        st.dataframe(df.describe(), use_container_width=True)
+        st.dataframe(describe('customer_data'), use_container_width=True)
 
 # Campaign Performance
-elif analysis_type == "Campaign Performance":
+@view
+def view_campaign_performance():
     st.header("📢 Campaign Performance Analysis")
     
-    df = data['campaign_performance']
+    get('campaign_performance')
+    cols = roles('campaign_performance')
     
     # Show columns
     with st.expander("📝 Available Columns"):
-        st.write(list(df.columns))
+        st.write(column_names('campaign_performance'))
     
     # KPIs
+    k = kpis('campaign_performance')
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Total Campaigns", len(df))
+        st.metric("Total Campaigns", k['total_campaigns'])
     
     with col2:
-        budget_col = safe_column(df, ['Budget', 'budget', 'Campaign_Budget', 'Spend'])
-        if budget_col:
-            st.metric("Total Budget", f"${df[budget_col].sum():,.0f}")
+        if k['total_budget'] is not None:
+            st.metric("Total Budget", f"${k['total_budget']:,.0f}")
     
     with col3:
-        conv_col = safe_column(df, ['Conversions', 'conversions', 'Total_Conversions'])
-        if conv_col:
-            st.metric("Total Conversions", f"{df[conv_col].sum():,}")
+        if k['total_conversions'] is not None:
+            st.metric("Total Conversions", f"{k['total_conversions']:,}")
     
     st.markdown("---")
     
@@ -283,177 +835,150 @@ elif analysis_type == "Campaign Performance":
     col1, col2 = st.columns(2)
     
     with col1:
-        # Find campaign name and metric columns
-        name_col = safe_column(df, ['CampaignName', 'Campaign_Name', 'Campaign', 'Name'])
-        metric_col = safe_column(df, ['Conversions', 'Revenue', 'Sales', 'Clicks'])
-        
-        if name_col and metric_col:
-            st.subheader(f"{metric_col} by Campaign")
-            fig = px.bar(df, x=name_col, y=metric_col,
-                       color=metric_col,
-                       color_continuous_scale='Viridis')
-            fig.update_xaxis(tickangle=-45)
+        if cols.name and cols.metric:
+            st.subheader(f"{cols.metric} by Campaign")
+            fig = dataset_chart('bar', 'campaign_performance', (cols.name, cols.metric),
+                                x_title=cols.name, y_title=cols.metric, colorscale='Viridis',
+                                tickangle=-45)
             st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        budget_col = safe_column(df, ['Budget', 'Spend', 'Cost'])
-        roi_col = safe_column(df, ['ROI', 'ROAS', 'Return'])
-        
-        if budget_col and roi_col:
+        if cols.spend and cols.roi:
             st.subheader("Budget vs ROI")
-            fig = px.scatter(df, x=budget_col, y=roi_col,
-                           color=roi_col,
-                           color_continuous_scale='RdYlGn')
+            fig = dataset_chart('scatter', 'campaign_performance', (cols.spend, cols.roi),
+                                x_title=cols.spend, y_title=cols.roi, colorscale='RdYlGn')
             st.plotly_chart(fig, use_container_width=True)
     
     st.markdown("---")
     st.subheader("Campaign Data")
-    st.dataframe(df, use_container_width=True)
+    show_table('campaign_performance')
 
 # Channel Attribution
-elif analysis_type == "Channel Attribution":
+@view
+def view_channel_attribution():
     st.header("📱 Channel Attribution Analysis")
     
-    df = data['channel_attribution']
+    get('channel_attribution')
+    cols = roles('channel_attribution')
     
     with st.expander("📝 Available Columns"):
-        st.write(list(df.columns))
+        st.write(column_names('channel_attribution'))
     
     col1, col2 = st.columns(2)
     
     with col1:
-        channel_col = safe_column(df, ['Channel', 'channel', 'Marketing_Channel'])
-        conv_col = safe_column(df, ['Conversions', 'conversions', 'Total_Conversions'])
-        
-        if channel_col and conv_col:
+        if cols.channel and cols.conversions:
             st.subheader("Conversions by Channel")
-            fig = px.bar(df, x=channel_col, y=conv_col,
-                       color=conv_col,
-                       color_continuous_scale='Blues')
+            fig = dataset_chart('bar', 'channel_attribution', (cols.channel, cols.conversions),
+                                x_title=cols.channel, y_title=cols.conversions, colorscale='Blues')
             st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        revenue_col = safe_column(df, ['Revenue', 'revenue', 'Sales', 'Amount'])
-        
-        if channel_col and revenue_col:
+        if cols.channel and cols.revenue:
             st.subheader("Revenue by Channel")
-            fig = px.pie(df, values=revenue_col, names=channel_col, hole=0.4)
+            fig = dataset_chart('pie', 'channel_attribution', (cols.revenue, cols.channel), hole=0.4)
             st.plotly_chart(fig, use_container_width=True)
     
     st.markdown("---")
-    st.dataframe(df, use_container_width=True)
+    show_table('channel_attribution')
 
 # Product Sales
-elif analysis_type == "Product Sales":
+@view
+def view_product_sales():
     st.header("🛍️ Product Sales Analysis")
     
-    df = data['product_sales']
+    get('product_sales')
+    cols = roles('product_sales')
     
     with st.expander("📝 Available Columns"):
-        st.write(list(df.columns))
+        st.write(column_names('product_sales'))
     
     # KPIs
+    k = kpis('product_sales')
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Total Products", len(df))
+        st.metric("Total Products", k['total_products'])
     
     with col2:
-        sales_col = safe_column(df, ['Sales', 'Revenue', 'Total_Sales', 'Amount'])
-        if sales_col:
-            st.metric("Total Sales", f"${df[sales_col].sum():,.0f}")
+        if k['total_sales'] is not None:
+            st.metric("Total Sales", f"${k['total_sales']:,.0f}")
     
     with col3:
-        qty_col = safe_column(df, ['Quantity', 'Units', 'Qty', 'Units_Sold'])
-        if qty_col:
-            st.metric("Total Units", f"{df[qty_col].sum():,}")
+        if k['total_units'] is not None:
+            st.metric("Total Units", f"{k['total_units']:,}")
     
     st.markdown("---")
     
     col1, col2 = st.columns(2)
     
     with col1:
-        product_col = safe_column(df, ['Product', 'ProductName', 'Product_Name', 'Item'])
-        sales_col = safe_column(df, ['Sales', 'Revenue', 'Amount'])
-        
-        if product_col and sales_col:
+        if cols.product and cols.top_sales:
             st.subheader("Top 10 Products")
-            top_products = df.nlargest(10, sales_col)
-            fig = px.bar(top_products, x=product_col, y=sales_col,
-                       color=sales_col,
-                       color_continuous_scale='Greens')
-            fig.update_xaxis(tickangle=-45)
+            top_products = side_table('product_sales', 'top10')
+            fig = chart('bar', label_array(top_products[cols.product]), value_array(top_products[cols.top_sales]),
+                        x_title=cols.product, y_title=cols.top_sales, colorscale='Greens',
+                        tickangle=-45)
             st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        category_col = safe_column(df, ['Category', 'Product_Category', 'Type'])
-        
-        if category_col and sales_col:
+        if cols.category and cols.top_sales:
             st.subheader("Sales by Category")
-            cat_sales = df.groupby(category_col)[sales_col].sum().reset_index()
-            fig = px.pie(cat_sales, values=sales_col, names=category_col)
+            cat_sales = groupby_sum('product_sales', cols.category, cols.top_sales)
+            fig = chart('pie', value_array(cat_sales[cols.top_sales]), label_array(cat_sales[cols.category]))
             st.plotly_chart(fig, use_container_width=True)
     
     st.markdown("---")
-    st.dataframe(df, use_container_width=True)
+    show_table('product_sales')
 
 # Geographic Analysis
-elif analysis_type == "Geographic Analysis":
+@view
+def view_geographic_analysis():
     st.header("🌍 Geographic Analysis")
     
-    df = data['geographic_data']
+    get('geographic_data')
+    cols = roles('geographic_data')
     
     with st.expander("📝 Available Columns"):
-        st.write(list(df.columns))
+        st.write(column_names('geographic_data'))
     
     col1, col2 = st.columns(2)
     
     with col1:
-        region_col = safe_column(df, ['Region', 'region', 'Area', 'Territory'])
-        
-        if region_col:
+        if cols.region:
             st.subheader("Distribution by Region")
-            region_dist = df[region_col].value_counts().reset_index()
-            region_dist.columns = [region_col, 'Count']
-            fig = px.bar(region_dist, x=region_col, y='Count',
-                       color='Count',
-                       color_continuous_scale='Reds')
+            region_dist = value_counts_top('geographic_data', cols.region)
+            fig = chart('bar', label_array(region_dist[cols.region]), value_array(region_dist['Count']),
+                        x_title=cols.region, y_title='Count', colorscale='Reds')
             st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        country_col = safe_column(df, ['Country', 'country', 'Nation'])
-        
-        if country_col:
+        if cols.country:
             st.subheader("Top 10 Countries")
-            country_dist = df[country_col].value_counts().head(10).reset_index()
-            country_dist.columns = [country_col, 'Count']
-            fig = px.pie(country_dist, values='Count', names=country_col)
+            country_dist = value_counts_top('geographic_data', cols.country, 10)
+            fig = chart('pie', value_array(country_dist['Count']), label_array(country_dist[cols.country]))
             st.plotly_chart(fig, use_container_width=True)
     
     st.markdown("---")
-    st.dataframe(df, use_container_width=True)
+    show_table('geographic_data')
 
 # Customer Journey
-elif analysis_type == "Customer Journey":
+@view
+def view_customer_journey():
     st.header("🛤️ Customer Journey Analysis")
     
-    # Funnel Data
-    funnel_df = data['funnel_data']
+    # Both datasets are loaded up front so load errors are reported together
+    get_many(['funnel_data', 'customer_journey'])
+    cols = roles('funnel_data')
     
+    # Funnel Data
     with st.expander("📝 Funnel Data Columns"):
-        st.write(list(funnel_df.columns))
+        st.write(column_names('funnel_data'))
     
     st.subheader("Conversion Funnel")
     
-    stage_col = safe_column(funnel_df, ['Stage', 'stage', 'Step', 'Funnel_Stage'])
-    count_col = safe_column(funnel_df, ['Count', 'count', 'Users', 'Visitors'])
-    
-    if stage_col and count_col:
-        fig = go.Figure(go.Funnel(
-            y=funnel_df[stage_col],
-            x=funnel_df[count_col],
-            textinfo="value+percent initial"
-        ))
+    if cols.stage and cols.users:
+        fig = dataset_chart('funnel', 'funnel_data', (cols.stage, cols.users))
         st.plotly_chart(fig, use_container_width=True)
     
     st.markdown("---")
@@ -462,34 +987,35 @@ elif analysis_type == "Customer Journey":
     
     with col1:
         st.subheader("Funnel Data")
-        st.dataframe(funnel_df, use_container_width=True)
+        show_table('funnel_data')
     
     with col2:
         st.subheader("Journey Data")
-        st.dataframe(data['customer_journey'].head(20), use_container_width=True)
+        st.dataframe(preview('customer_journey', 20), use_container_width=True)
 
 # Lead Scoring
-elif analysis_type == "Lead Scoring":
+@view
+def view_lead_scoring():
     st.header("🎯 Lead Scoring Analysis")
     
-    df = data['lead_scoring_results']
+    get('lead_scoring_results')
+    cols = roles('lead_scoring_results')
     
     with st.expander("📝 Available Columns"):
-        st.write(list(df.columns))
+        st.write(column_names('lead_scoring_results'))
     
-    score_col = safe_column(df, ['LeadScore', 'Score', 'Lead_Score', 'Probability'])
-    
-    if score_col:
+    if cols.score:
+        k = kpis('lead_scoring_results')
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("Avg Score", f"{df[score_col].mean():.2f}")
+            st.metric("Avg Score", f"{k['avg_lead_score']:.2f}")
         
         with col2:
-            st.metric("Max Score", f"{df[score_col].max():.2f}")
+            st.metric("Max Score", f"{k['max_lead_score']:.2f}")
         
         with col3:
-            st.metric("Total Leads", len(df))
+            st.metric("Total Leads", k['total_leads'])
         
         st.markdown("---")
         
@@ -497,64 +1023,85 @@ elif analysis_type == "Lead Scoring":
         
         with col1:
             st.subheader("Score Distribution")
-            fig = px.histogram(df, x=score_col, nbins=30,
-                             color_discrete_sequence=['#9b59b6'])
+            centers, width, counts = column_hist('lead_scoring_results', cols.score)
+            fig = chart('histogram', centers, width, counts,
+                        x_title=cols.score, color='#9b59b6')
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             st.subheader("Score Box Plot")
-            fig = px.box(df, y=score_col,
-                       color_discrete_sequence=['#e74c3c'])
+            fig = dataset_chart('box', 'lead_scoring_results', (cols.score,),
+                                y_title=cols.score, color='#e74c3c')
             st.plotly_chart(fig, use_container_width=True)
     
     st.markdown("---")
-    st.dataframe(df, use_container_width=True)
+    show_table('lead_scoring_results')
 
 # Feature Importance
-elif analysis_type == "Feature Importance":
+@view
+def view_feature_importance():
     st.header("📊 Feature Importance Analysis")
     
-    df = data['feature_importance']
+    get('feature_importance')
+    cols = roles('feature_importance')
     
     with st.expander("📝 Available Columns"):
-        st.write(list(df.columns))
-    
-    feature_col = safe_column(df, ['Feature', 'feature', 'Variable', 'Column'])
-    importance_col = safe_column(df, ['Importance', 'importance', 'Score', 'Weight'])
+        st.write(column_names('feature_importance'))
     
-    if feature_col and importance_col:
+    if cols.feature and cols.importance:
         st.subheader("Feature Importance Ranking")
         
-        sorted_df = df.sort_values(importance_col, ascending=True)
-        
-        fig = px.bar(sorted_df, x=importance_col, y=feature_col,
-                   orientation='h',
-                   color=importance_col,
-                   color_continuous_scale='Viridis')
+        # Rows are stored in ascending importance by the cache step
+        fig = dataset_chart('bar', 'feature_importance', (cols.importance, cols.feature),
+                            x_title=cols.importance, y_title=cols.feature, colorscale='Viridis',
+                            orientation='h')
         st.plotly_chart(fig, use_container_width=True)
     
     st.markdown("---")
-    st.dataframe(df, use_container_width=True)
+    show_table('feature_importance')
 
 # Correlation Analysis
-elif analysis_type == "Correlation Analysis":
+@view
+def view_correlation_analysis():
     st.header("🔗 Correlation Analysis")
     
-    df = data['correlation_matrix']
+    df = get('correlation_matrix')
     
     st.subheader("Correlation Matrix Heatmap")
     
+    # Wide matrices are cut down to the most correlated features to keep the heatmap readable
+    k = len(df.columns)
+    if k > 5:
+        k = st.slider("Max features", 5, min(50, k), min(20, k))
+    
     try:
-        fig = px.imshow(df,
-                       text_auto='.2f',
-                       aspect="auto",
-                       color_continuous_scale='RdBu_r')
+        df = top_correlated(k)
+        fig = chart('heatmap', df.to_numpy(dtype=np.float32),
+                    df.columns.to_numpy().astype(str), df.index.to_numpy().astype(str),
+                    colorscale='RdBu_r')
         st.plotly_chart(fig, use_container_width=True)
     except:
         st.info("Correlation matrix format may need adjustment")
     
     st.markdown("---")
-    st.dataframe(df, use_container_width=True)
+    show_table('correlation_matrix')
+
+# Each view is a fragment, so its own widgets rerun only that view
+VIEWS = {
+    "Overview": view_overview,
+    "Customer Analysis": view_customer_analysis,
+    "Campaign Performance": view_campaign_performance,
+    "Channel Attribution": view_channel_attribution,
+    "Product Sales": view_product_sales,
+    "Geographic Analysis": view_geographic_analysis,
+    "Customer Journey": view_customer_journey,
+    "Lead Scoring": view_lead_scoring,
+    "Feature Importance": view_feature_importance,
+    "Correlation Analysis": view_correlation_analysis
+}
+
+VIEWS[analysis_type]()
+show_load_status()
 
 # Footer
 st.markdown("---")